@@ -1,10 +1,136 @@
+import os
 import re
 import logging
-from rapidfuzz import fuzz
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from rapidfuzz import fuzz, process
 from scorer import ConfidenceScorer
 
+try:
+    import re2
+    # Unsupported patterns fall back to stdlib re; don't log RE2's parse errors
+    _RE2_OPTIONS = re2.Options()
+    _RE2_OPTIONS.log_errors = False
+except (ImportError, AttributeError):
+    # Missing, or a different "re2" package without Options
+    re2 = None
+
+try:
+    from re import _parser as _sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse as _sre_parse
+
 logger = logging.getLogger(__name__)
 
+# Minimum partial_ratio for a line to count as containing a field label
+FUZZY_THRESHOLD = 85
+
+# Currency amounts appearing on the same line as a fuzzy-matched label
+_AMOUNT_RE = re.compile(r"(?:Rs\.|₹)?\s?([\d,]+\.?\d*)")
+_DIGIT_RE = re.compile(r"\d")
+
+_REGEX_FLAGS = re.IGNORECASE | re.MULTILINE
+# ASCII control characters that Unicode \s matches but ASCII \s (or RE2's \s,
+# which also excludes \v) does not. Pages free of these and of non-ASCII text
+# match identically under re.ASCII and RE2.
+_ASCII_UNSAFE_RE = re.compile(r"[\x0b\x1c-\x1f]")
+# Python-only syntax RE2 would silently read differently ({,n} is a literal there)
+_RE2_UNSAFE_RE = re.compile(r"\{,")
+
+# Shortest literal worth using as a field's lead token
+_MIN_LEAD_LEN = 4
+
+def _literal_runs(regex: str) -> list:
+    """
+    Returns the (literal, prefix_width) runs of consecutive ASCII literals
+    that every match of `regex` passes through, in pattern order.
+    prefix_width is the most characters before the run (None if unbounded).
+    """
+    parsed = _sre_parse.parse(regex, _REGEX_FLAGS)
+
+    def flatten(items):
+        # Groups are matched in sequence, so their contents are mandatory too
+        for op, av in items:
+            if op is _sre_parse.SUBPATTERN:
+                yield from flatten(av[-1])
+            else:
+                yield op, av
+
+    runs = []
+    run, run_prefix, prefix = [], 0, 0
+    for op, av in flatten(parsed):
+        if op is _sre_parse.LITERAL and av < 128:
+            if not run:
+                run_prefix = prefix
+            run.append(chr(av))
+            width = 1
+        else:
+            if run:
+                runs.append(("".join(run), run_prefix))
+                run = []
+            width = _sre_parse.SubPattern(parsed.state, [(op, av)]).getwidth()[1]
+        if prefix is not None:
+            prefix = None if width >= _sre_parse.MAXREPEAT - 1 else prefix + width
+    if run:
+        runs.append(("".join(run), run_prefix))
+    return runs
+
+
+def _lead_literal(regex: str):
+    """
+    Finds a literal every match of `regex` must contain, for locating where a
+    field can first match with a plain str.find.
+    Returns (literal_lowercase, max_prefix) where max_prefix is the most
+    characters a match can have before the literal (None if unbounded),
+    or None if the pattern has no usable ASCII literal of _MIN_LEAD_LEN chars.
+    """
+    # The analysis relies on re's private parser; if it fails or its internals
+    # change, the field is simply scanned from the start of every page
+    try:
+        runs = _literal_runs(regex)
+    except Exception:
+        return None
+
+    runs = [(lit, pre) for lit, pre in runs if len(lit) >= _MIN_LEAD_LEN]
+    if not runs:
+        return None
+    # Prefer a literal with a bounded prefix (gives a start position), then the longest
+    literal, max_prefix = max(runs, key=lambda r: (r[1] is not None, len(r[0])))
+    return literal.lower(), max_prefix
+
+
+def _last_amount(line: str):
+    """
+    Returns the last number in a line (often the value is at the end), or None.
+    Matches are walked lazily and only the last one containing a digit is kept,
+    so no list of candidates is built.
+    """
+    value = None
+    for match in _AMOUNT_RE.finditer(line):
+        number = match.group(1)
+        # Skip matches made only of separators (e.g. ",")
+        if _DIGIT_RE.search(number):
+            value = number
+    return value
+
+# Fuzzy fallback runs fields on a shared thread pool when more than this many need it
+_PARALLEL_MIN_FIELDS = 2
+_FUZZY_POOL = None
+_FUZZY_POOL_LOCK = threading.Lock()
+
+def _fuzzy_pool():
+    """
+    Returns the module-wide thread pool for the fuzzy stage, creating it on first use.
+    Safe to call from several threads: only one pool is ever created.
+    """
+    global _FUZZY_POOL
+    if _FUZZY_POOL is None:
+        with _FUZZY_POOL_LOCK:
+            if _FUZZY_POOL is None:
+                _FUZZY_POOL = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1))
+    return _FUZZY_POOL
+
 
 class FieldExtractor:
     def __init__(self, patterns):
@@ -12,89 +138,215 @@ class FieldExtractor:
         Initialize with a specific pattern set (dict).
         """
         self.patterns = patterns
+        # Compile each field regex once instead of on every extract() call
+        self._compiled = {
+            name: (
+                re.compile(cfg["regex"], _REGEX_FLAGS),
+                [k.lower() for k in cfg["keywords"]],
+            )
+            for name, cfg in patterns.items()
+        }
+        self._regexes = {name: pattern for name, (pattern, _) in self._compiled.items()}
+
+        # ASCII-mode variants, used for pages that are pure ASCII: they skip
+        # Unicode case folding and give the same matches on such text.
+        # With google-re2 installed these are linear-time RE2 patterns.
+        self._ascii_regexes = {
+            name: self._compile_ascii(cfg["regex"], self._compiled[name][0])
+            for name, cfg in patterns.items()
+        }
+        self._leads = {name: _lead_literal(cfg["regex"]) for name, cfg in patterns.items()}
+
+    @staticmethod
+    def _compile_ascii(regex, fallback):
+        """
+        Compiles regex for ASCII text: with RE2 when available and the pattern
+        is regular (no lookarounds or backreferences), else with re.ASCII.
+        Returns fallback if neither works (e.g. the pattern sets its own (?u) flag).
+        """
+        if re2 is not None and not _RE2_UNSAFE_RE.search(regex):
+            try:
+                return re2.compile("(?im)" + regex, _RE2_OPTIONS)
+            except Exception:
+                pass
+        try:
+            return re.compile(regex, _REGEX_FLAGS | re.ASCII)
+        except (re.error, ValueError):
+            return fallback
+
+    def _start_positions(self, text: str, fields) -> dict:
+        """
+        Returns, for each of `fields` that can match in this ASCII page, the
+        earliest position a match can start, using each field's lead literal.
+        Fields whose lead literal is absent are left out: they cannot match.
+        """
+        text_lower = None
+        starts = {}
+        for name in fields:
+            lead = self._leads[name]
+            if lead is None:
+                starts[name] = 0
+                continue
+            if text_lower is None:
+                text_lower = text.lower()
+            literal, max_prefix = lead
+            idx = text_lower.find(literal)
+            if idx == -1:
+                continue
+            starts[name] = 0 if max_prefix is None else max(0, idx - max_prefix)
+        return starts
 
     def extract(self, text: str) -> dict:
         """
         Extracts fields from text based on configured patterns.
         Returns a dict with value and confidence for each field.
         """
-        results = {}
-        lines = text.split("\n")
+        return self.extract_pages([text])
 
-        for field_name, config in self.patterns.items():
-            extracted_data = {
-                "value": None,
-                "confidence": 0.0,
-                "method": "none"
-            }
+    def extract_pages(self, pages) -> dict:
+        """
+        Extracts fields from an iterable of page texts, consuming it lazily.
+        A field's first regex match (in page order) wins; otherwise the best
+        fuzzy match across all pages is kept. Stops reading pages as soon as
+        every field has a regex match.
+        Returns a dict with value and confidence for each field.
+        """
+        regex_hits = {}
+        # Regex matches with an empty value, used only if nothing better turns up
+        empty_hits = {}
+        # Lines holding a digit, from every page read, for the fuzzy fallback:
+        # a label match only counts if its line holds a number, so other lines
+        # (including empty ones) can never produce a value
+        digit_lines = []
+
+        for text in pages:
+            pending = [name for name in self._compiled if name not in regex_hits]
+            if text.isascii() and not _ASCII_UNSAFE_RE.search(text):
+                regexes = self._ascii_regexes
+                # Lowercasing is exact case folding only for ASCII text
+                starts = self._start_positions(text, pending)
+            else:
+                regexes = self._regexes
+                starts = dict.fromkeys(pending, 0)
+
+            for field_name in pending:
+                # Strategy 1: Strict Regex Match
+                # We search the whole page for multi-line regex capabilities if needed
+                if field_name not in starts:
+                    continue
+                match = regexes[field_name].search(text, starts[field_name])
+                if match:
+                    # Assuming the last group is the value we want. 
+                    # Our patterns use capturing groups: (Label)...(Value)
+                    # So groups()[-1] should be the value.
+                    value = match.groups()[-1].strip()
+                    extracted_data = {
+                        "value": value,
+                        "confidence": ConfidenceScorer.calculate("regex"),
+                        "method": "regex"
+                    }
+                    if value:
+                        regex_hits[field_name] = extracted_data
+                    else:
+                        empty_hits.setdefault(field_name, extracted_data)
 
-            # Strategy 1: Strict Regex Match
-            # We search the whole text first for multi-line regex capabilities if needed
-            match = re.search(config["regex"], text, re.IGNORECASE | re.MULTILINE)
-            if match:
-                # Assuming the last group is the value we want. 
-                # Our patterns use capturing groups: (Label)...(Value)
-                # So groups()[-1] should be the value.
-                value = match.groups()[-1].strip()
-                extracted_data = {
-                    "value": value,
-                    "confidence": ConfidenceScorer.calculate("regex"),
-                    "method": "regex"
-                }
-            
-            # Strategy 2: Fuzzy Logic Fallback
-            if not extracted_data["value"]:
-                fuzzy_res = self._fuzzy_search(lines, config["keywords"])
-                if fuzzy_res:
-                    extracted_data = fuzzy_res
-
-            results[field_name] = extracted_data
+            # Short-circuit: nothing on later pages can beat a regex match
+            if len(regex_hits) == len(self._compiled):
+                break
+            digit_lines.extend(line for line in text.split("\n") if _DIGIT_RE.search(line))
 
+        # Strategy 2: Fuzzy Logic Fallback, once over all pages read, only for
+        # fields no page gave a regex match for
+        fuzzy_fields = [name for name in self._compiled if name not in regex_hits]
+        fuzzy_hits = {}
+        if fuzzy_fields:
+            fuzzy_hits = dict(zip(fuzzy_fields, self._fuzzy_lines(digit_lines, fuzzy_fields)))
+
+        results = {}
+        for field_name in self._compiled:
+            results[field_name] = (
+                regex_hits.get(field_name)
+                or fuzzy_hits.get(field_name)
+                or empty_hits.get(field_name)
+                or {"value": None, "confidence": 0.0, "method": "none"}
+            )
         return results
 
-    def _fuzzy_search(self, lines: list, keywords: list) -> dict:
+    def _fuzzy_lines(self, lines: list, fields: list) -> list:
+        """
+        Runs the fuzzy fallback for each of `fields` over `lines`.
+        Returns the results in the same order as `fields`.
+        """
+        # Lowercased once and shared by every field
+        lines_lower = [line.lower() for line in lines]
+        jobs = [(lines, lines_lower, self._compiled[field_name][1]) for field_name in fields]
+
+        if len(jobs) <= _PARALLEL_MIN_FIELDS:
+            return [self._fuzzy_search(*job) for job in jobs]
+
+        # rapidfuzz releases the GIL while scoring, so fields run in parallel
+        # on threads; each cdist call is then kept single-threaded.
+        return list(_fuzzy_pool().map(lambda job: self._fuzzy_search(*job, workers=1), jobs))
+
+    def _fuzzy_search(self, lines: list, lines_lower: list, keywords: list, workers: int = -1) -> dict:
         """
         Scans lines for fuzzy matches of keywords.
+        `lines` are the candidate lines, `lines_lower` their lowercased
+        counterparts (same order), and `keywords` are already lowercased.
         Returns the best match or None.
         """
         best_candidate = None
         best_score = 0
         best_method_score = 0
 
-        for line in lines:
-            # Skip empty lines
-            if not line.strip():
+        if not lines or not keywords:
+            return None
+
+        # Use partial_ratio to find keyword inside a sentence.
+        # cdist scores every (keyword, line) pair in C++ in one call;
+        # pairs below the label threshold come back as 0.
+        scores = process.cdist(
+            keywords,
+            lines_lower,
+            scorer=fuzz.partial_ratio,
+            score_cutoff=FUZZY_THRESHOLD,
+            dtype=np.float64,
+            workers=workers,
+        )
+
+        # Threshold for considering it a "match" of the label.
+        # Transpose so hits are visited line by line, keyword by keyword.
+        for line_idx, kw_idx in np.argwhere(scores.T >= FUZZY_THRESHOLD):
+            line = lines[line_idx]
+            score = float(scores[kw_idx, line_idx])
+
+            # Confidence Score Calculation
+            # Use the centralized scorer. A hit that cannot beat the current
+            # best is skipped before we spend any time parsing its line.
+            # Confidence never decreases with score, so a score no higher than
+            # the best one so far is skipped without calling the scorer at all.
+            if score <= best_method_score:
+                continue
+            confidence = ConfidenceScorer.calculate("fuzzy", score)
+            if confidence <= best_score:
                 continue
 
-            for keyword in keywords:
-                # Use partial_ratio to find keyword inside a sentence
-                score = fuzz.partial_ratio(keyword.lower(), line.lower())
-                
-                # Threshold for considering it a "match" of the label
-                if score >= 85:
-                    # If we found the label, look for a value nearby (in the same line)
-                    # This is a heuristic: usually "Premium: 1000"
-                    
-                    # Extract potential values (numbers/money) from the *same line*
-                    # This is a simple heuristic; can be expanded to looking at next line.
-                    numbers = re.findall(r"(?:Rs\.|₹)?\s?([\d,]+\.?\d*)", line)
-                    
-                    # Filter out purely whitespace or empty matches
-                    valid_values = [n for n in numbers if n.strip() and any(c.isdigit() for c in n)]
-                    
-                    if valid_values:
-                        # Take the last number found in line (often the value is at end)
-                        # or the one that is not the label itself if numeric.
-                        
-                        # Confidence Score Calculation
-                        # Use the centralized scorer
-                        confidence = ConfidenceScorer.calculate("fuzzy", score)
-                        
-                        if confidence > best_score:
-                            best_score = confidence
-                            best_candidate = valid_values[-1] # assumption
-                            best_method_score = score
-                            
+            # If we found the label, look for a value nearby (in the same line)
+            # This is a heuristic: usually "Premium: 1000"
+
+            # Extract potential values (numbers/money) from the *same line*
+            # This is a simple heuristic; can be expanded to looking at next line.
+            value = _last_amount(line)
+
+            if value:
+                best_score = confidence
+                best_candidate = value # assumption
+                best_method_score = score
+
+                # A perfect label match already has the highest fuzzy confidence
+                if score == 100:
+                    break
+
         if best_candidate:
             return {
                 "value": best_candidate,
@@ -1,5 +1,8 @@
+import mmap
 import os
 import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 try:
     from pypdf import PdfReader
 except ImportError:
@@ -12,72 +15,163 @@ try:
 except ImportError:
     OCR_AVAILABLE = False
 
+# Pages with fewer letters than this are checked for embedded images (scans)
+MIN_ALPHA_CHARS_PER_PAGE = 100
+
 class DocumentLoader:
     """
     Handles loading of documents from various formats (Text, PDF).
     Supports OCR for scanned PDFs.
     """
 
+    def __init__(self, ocr_dpi: int = 150, ocr_config: str = "--oem 1 --psm 6", ocr_workers: int = None):
+        """
+        ocr_dpi: resolution used when rendering scanned pages for OCR.
+        ocr_config: extra Tesseract flags (LSTM engine, single text block).
+        ocr_workers: scanned pages OCR'd concurrently per document (default: CPU count).
+        """
+        self.ocr_dpi = ocr_dpi
+        self.ocr_config = ocr_config
+        self.ocr_workers = ocr_workers or os.cpu_count() or 1
+
     def load(self, file_path: str) -> str:
         """
         Detects file type and extracts text.
         """
+        return "\n".join(text for _, text in self.iter_pages(file_path) if text)
+
+    def iter_pages(self, file_path: str):
+        """
+        Detects file type and returns a generator of (page_index, text),
+        in page order. Plain text files are a single page.
+        File and format errors are raised here rather than on first iteration.
+        """
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
 
         ext = os.path.splitext(file_path)[1].lower()
 
         if ext == ".txt":
-            return self._load_txt(file_path)
+            return iter([(0, self._load_txt(file_path))])
         elif ext == ".pdf":
-            return self._load_pdf(file_path)
+            if PdfReader is None:
+                raise ImportError("pypdf is required for PDF support. Install it via 'pip install pypdf'")
+            pages = self._iter_pdf_pages(file_path)
+            # Run the generator up to its first yield: this opens the PDF, so
+            # format errors surface here, and from then on closing the
+            # generator (or dropping it) releases the file
+            next(pages)
+            return pages
         else:
             raise ValueError(f"Unsupported file format: {ext}")
 
     def _load_txt(self, file_path):
-        with open(file_path, "r", encoding="utf-8") as f:
-            return f.read()
-
-    def _load_pdf(self, file_path):
-        if PdfReader is None:
-            raise ImportError("pypdf is required for PDF support. Install it via 'pip install pypdf'")
-        
-        reader = PdfReader(file_path)
-        text = []
-        for page in reader.pages:
-            content = page.extract_text()
-            if content:
-                text.append(content)
-        
-        full_text = "\n".join(text)
-
-        # Check for scanned PDF (empty or very little text)
-        if len(full_text.strip()) < 50:
-            print("[!] Detected scanned/image PDF. Attempting OCR...")
-            return self._ocr_pdf(file_path)
-        
-        return full_text
-
-    def _ocr_pdf(self, file_path):
-        if not OCR_AVAILABLE:
-            print("[!] OCR dependencies not found (pytesseract/pdf2image).")
-            print("    Please install Tesseract-OCR and Poppler.")
+        if os.path.getsize(file_path) == 0:
             return ""
+        # Decode straight from a read-only mapping so the raw bytes are paged
+        # in by the OS instead of being copied into a bytes object first
+        with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            text = str(mm, "utf-8")
+        # Match text-mode universal newlines
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return text
 
+    @staticmethod
+    def _open_pdf(file_path):
+        """
+        Opens a PDF through a read-only memory map and returns (mapping, reader).
+        Given a path, PdfReader would copy the whole file into memory; given the
+        mapping it reads objects on demand and the OS pages the file in.
+        """
+        with open(file_path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return mm, PdfReader(mm)
+        except Exception:
+            mm.close()
+            raise
+
+    def _iter_pdf_pages(self, file_path):
+        """
+        Yields page texts as they become available. Born-digital pages are
+        yielded straight away; pages that look scanned are OCR'd in a thread
+        pool (Tesseract and Poppler run as separate processes) and yielded
+        in order once done. Only pages not yet yielded are kept in memory.
+        The first item yielded is None, once the PDF is open (see iter_pages).
+        Closes the memory map and the OCR pool once exhausted or closed.
+        """
+        mm, reader = self._open_pdf(file_path)
+        ocr_warned = False
+        queue = deque()
+        pool = ThreadPoolExecutor(max_workers=self.ocr_workers)
         try:
-            # Convert PDF to images
-            # Note: poppler_path might need to be configured if not in PATH
-            images = convert_from_path(file_path)
-            
-            ocr_text = []
-            for i, image in enumerate(images):
-                print(f"    Processing page {i+1} with OCR...")
-                page_text = pytesseract.image_to_string(image)
-                ocr_text.append(page_text)
-            
-            return "\n".join(ocr_text)
+            yield None
 
+            # Pages are fetched one at a time by index rather than materializing
+            # the whole page list up front
+            for i in range(len(reader.pages)):
+                page = reader.pages[i]
+                content = page.extract_text() or ""
+                future = None
+                if self._needs_ocr(page, content):
+                    if not ocr_warned:
+                        ocr_warned = True
+                        print("[!] Detected scanned/image page(s). Attempting OCR...")
+                        if not OCR_AVAILABLE:
+                            print("[!] OCR dependencies not found (pytesseract/pdf2image).")
+                            print("    Please install Tesseract-OCR and Poppler.")
+                    if OCR_AVAILABLE:
+                        future = pool.submit(self._ocr_page, file_path, i)
+                queue.append((i, future, content))
+
+                while queue and (queue[0][1] is None or queue[0][1].done()):
+                    yield self._resolve_page(*queue.popleft())
+
+            while queue:
+                yield self._resolve_page(*queue.popleft())
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+            mm.close()
+
+    @staticmethod
+    def _resolve_page(index, future, content):
+        """
+        Returns (index, text) for a queued page, preferring OCR text when available.
+        """
+        if future is None:
+            return index, content
+        try:
+            page_text = future.result()
         except Exception as e:
             print(f"[!] OCR Failed: {e}")
             print("    Ensure Tesseract and Poppler are installed and in System PATH.")
-            return ""
+            page_text = ""
+        return index, page_text or content
+
+    @staticmethod
+    def _needs_ocr(page, content: str) -> bool:
+        """
+        A page needs OCR if it embeds images and has little or no extractable
+        text (e.g. a scan, possibly with a stamped header).
+        Pages without images keep their digital text however short it is:
+        blank pages and digit-only schedules are never OCR'd.
+        """
+        alpha_chars = sum(1 for ch in content if ch.isalpha())
+        if alpha_chars >= MIN_ALPHA_CHARS_PER_PAGE:
+            return False
+        try:
+            return len(page.images) > 0
+        except Exception:
+            return False
+
+    def _ocr_page(self, file_path, index):
+        print(f"    Processing page {index+1} with OCR...")
+        # Convert PDF page to image
+        # Note: poppler_path might need to be configured if not in PATH
+        images = convert_from_path(
+            file_path, dpi=self.ocr_dpi, first_page=index + 1, last_page=index + 1
+        )
+        return "\n".join(
+            pytesseract.image_to_string(image, config=self.ocr_config) for image in images
+        )
@@ -2,6 +2,7 @@ import argparse
 import json
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 
 from loader import DocumentLoader
 from preprocessor import clean_text
@@ -21,37 +22,102 @@ def get_patterns(insurer_name: str):
         print(f"Warning: Unknown insurer '{insurer_name}'. Using base patterns.")
         return base_patterns.BASE_FIELDS
 
+# Per-process state for batch mode, built once by _init_worker
+_worker_loader = None
+_worker_extractor = None
+
+def _init_worker(patterns):
+    """
+    Pool initializer: compiles the patterns once per worker process.
+    Documents already run one per CPU, so each worker OCRs one page at a time
+    rather than starting a Tesseract per CPU of its own.
+    """
+    global _worker_loader, _worker_extractor
+    _worker_loader = DocumentLoader(ocr_workers=1)
+    _worker_extractor = FieldExtractor(patterns)
+
+def _process_file(file_path: str) -> dict:
+    """
+    Runs the load -> clean -> extract pipeline for one file in a worker.
+    Returns a JSON-serializable record; errors are reported, not raised.
+    """
+    try:
+        pages = _worker_loader.iter_pages(file_path)
+        results = _worker_extractor.extract_pages(clean_text(text) for _, text in pages)
+        return {"file": file_path, "results": results}
+    except Exception as e:
+        return {"file": file_path, "error": str(e)}
+
+def run_batch(directory: str, patterns: dict, output_path: str):
+    """
+    Processes every PDF/TXT file in a directory with a pool of worker
+    processes, writing one JSON line per document to output_path.
+    """
+    files = sorted(
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if os.path.splitext(name)[1].lower() in (".pdf", ".txt")
+    )
+    print(f"[*] Found {len(files)} document(s) in {directory}")
+
+    failed = 0
+    with ProcessPoolExecutor(
+        max_workers=os.cpu_count(), initializer=_init_worker, initargs=(patterns,)
+    ) as pool, open(output_path, "w", encoding="utf-8") as out:
+        for record in pool.map(_process_file, files):
+            if "error" in record:
+                failed += 1
+                print(f"[!] {record['file']}: {record['error']}")
+            out.write(json.dumps(record) + "\n")
+
+    print(f"[*] Wrote {len(files)} result(s) to {output_path} ({failed} failed)")
+
 def main():
     parser = argparse.ArgumentParser(description="Insurance Document Parser Engine")
-    parser.add_argument("file_path", help="Path to the document (PDF/TXT)")
+    parser.add_argument("file_path", nargs="?", help="Path to the document (PDF/TXT)")
     parser.add_argument("--insurer", default="base", help="Insurer name (hdfc, lic) for specific patterns")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument("--batch", metavar="DIR", help="Process every PDF/TXT in a directory")
+    parser.add_argument("--output", default="results.jsonl", help="JSONL output file for --batch")
     
     args = parser.parse_args()
+    if not args.file_path and not args.batch:
+        parser.error("either file_path or --batch DIR is required")
+    if args.file_path and args.batch:
+        parser.error("file_path and --batch DIR cannot be used together")
+
+    if args.batch:
+        if not os.path.isdir(args.batch):
+            print(f"[!] Not a directory: {args.batch}")
+            sys.exit(1)
+        print(f"[*] Loading patterns for: {args.insurer}...")
+        run_batch(args.batch, get_patterns(args.insurer), args.output)
+        return
 
-    # 1. Load Document
+    # 1. Open Document (pages are read lazily during extraction)
     print(f"[*] Loading document: {args.file_path}...")
     loader = DocumentLoader()
     try:
-        raw_text = loader.load(args.file_path)
+        pages = loader.iter_pages(args.file_path)
     except Exception as e:
         print(f"[!] Error loading file: {e}")
         sys.exit(1)
 
-    # 2. Preprocess
-    print("[*] Cleaning text...")
-    cleaned_text = clean_text(raw_text)
-    
-    # 3. Select Patterns
+    # 2. Select Patterns
     print(f"[*] Loading patterns for: {args.insurer}...")
     patterns = get_patterns(args.insurer)
 
-    # 4. Extract
-    print("[*] Extracting data...")
+    # 3. Preprocess + Extract, page by page
+    # Stops reading as soon as every field has a regex match.
+    print("[*] Cleaning text and extracting data...")
     extractor = FieldExtractor(patterns)
-    results = extractor.extract(cleaned_text)
+    try:
+        results = extractor.extract_pages(clean_text(text) for _, text in pages)
+    except Exception as e:
+        print(f"[!] Error processing file: {e}")
+        sys.exit(1)
 
-    # 5. Output
+    # 4. Output
     if args.json:
         print(json.dumps(results, indent=2))
     else:
@@ -1,5 +1,42 @@
 import re
 
+class _CleanTable(dict):
+    """
+    str.translate mapping that deletes every non-printable character except
+    newline (control, format, private-use, unassigned and separator characters
+    other than the plain space) and keeps the rest. Non-breaking space is
+    mapped to a space instead. Entries are filled in on first sight of each
+    character, so any Unicode input works without a table covering every code point.
+    """
+
+    def __missing__(self, codepoint):
+        ch = chr(codepoint)
+        keep = ch.isprintable() or ch == "\n"
+        self[codepoint] = codepoint if keep else None
+        return self[codepoint]
+
+_CLEAN_TABLE = _CleanTable({0xA0: 0x20})
+
+# Runs of whitespace other than newline
+_WS_RE = re.compile(r"[^\S\n]+")
+# Spaces around a newline
+_LINE_EDGE_RE = re.compile(r" *\n *")
+
+class _AmountTable(dict):
+    """
+    str.translate mapping that keeps decimal digits and '.' and deletes
+    everything else. Entries are filled in on first sight of each character,
+    so any Unicode input works without a table covering every code point.
+    """
+
+    def __missing__(self, codepoint):
+        ch = chr(codepoint)
+        keep = ch.isdecimal() or ch == "."
+        self[codepoint] = codepoint if keep else None
+        return self[codepoint]
+
+_AMOUNT_TABLE = _AmountTable()
+
 def clean_text(text: str) -> str:
     """
     Cleans and normalizes text from PDF/Images.
@@ -10,17 +47,13 @@ def clean_text(text: str) -> str:
     if not text:
         return ""
         
-    # Replace non-breaking space
-    text = text.replace("\xa0", " ")
-    
-    # Remove control characters except newlines
-    text = "".join(ch for ch in text if ch.isprintable() or ch == '\n')
+    # Replace non-breaking space and remove non-printable characters except newlines
+    text = text.translate(_CLEAN_TABLE)
 
     # Normalize whitespace (but keep newlines for context)
-    # Convert multiple spaces to single space, but preserve newlines
-    lines = text.split('\n')
-    cleaned_lines = [re.sub(r"\s+", " ", line).strip() for line in lines]
-    text = "\n".join(cleaned_lines)
+    # Convert multiple spaces to single space, then trim each line's edges
+    text = _WS_RE.sub(" ", text)
+    text = _LINE_EDGE_RE.sub("\n", text).strip(" ")
     
     return text
 
@@ -31,8 +64,19 @@ def normalize_amount(amount_str: str) -> float:
     if not amount_str:
         return 0.0
     
-    # Remove currency symbols and commas
-    cleaned = re.sub(r"[^\d.]", "", amount_str)
+    # Drop a leading 'Rs.' so its dot is not read as a decimal point
+    # ('Rs.25,000'); '₹' and other symbols are removed by the table
+    amount_str = amount_str.lstrip()
+    if amount_str[:3].lower() == "rs.":
+        amount_str = amount_str[3:]
+
+    # Remove currency symbols and commas, then any sentence-ending period
+    cleaned = amount_str.translate(_AMOUNT_TABLE).rstrip(".")
+
+    # Several dots: the last one is the decimal point, the rest are grouping
+    if cleaned.count(".") > 1:
+        last_dot = cleaned.rfind(".")
+        cleaned = cleaned[:last_dot].replace(".", "") + cleaned[last_dot:]
     try:
         return float(cleaned)
     except ValueError:
@@ -0,0 +1,239 @@
+import importlib
+import re
+import sys
+import threading
+import time
+import types
+import unittest
+from unittest import mock
+
+import extractor
+from extractor import FieldExtractor, _lead_literal
+
+
+class TestRegexExtraction(unittest.TestCase):
+    def test_overlapping_labels_each_get_their_first_match(self):
+        patterns = {
+            "premium": {"regex": r"(Premium)\s*[:]\s*([\d,]+)", "keywords": ["premium"]},
+            "premium_amount": {"regex": r"(Premium\s*Amount)\s*[:]\s*([\d,]+)", "keywords": ["premium amount"]},
+        }
+        text = "Premium Amount: 500\nPremium: 100"
+        results = FieldExtractor(patterns).extract(text)
+        self.assertEqual(results["premium"]["value"], "100")
+        self.assertEqual(results["premium_amount"]["value"], "500")
+        self.assertEqual(results["premium_amount"]["method"], "regex")
+
+    def test_same_named_groups_in_different_fields(self):
+        patterns = {
+            "customer_id": {"regex": r"(?P<label>Customer\s*ID)\s*:\s*(?P<value>\w+)", "keywords": ["customer id"]},
+            "policy_number": {"regex": r"(?P<label>Policy\s*No)\s*:\s*(?P<value>\w+)", "keywords": ["policy no"]},
+        }
+        text = "Policy No: P123\nCustomer ID: C9"
+        results = FieldExtractor(patterns).extract(text)
+        self.assertEqual(results["customer_id"]["value"], "C9")
+        self.assertEqual(results["policy_number"]["value"], "P123")
+
+    def test_unicode_page_matches_like_ascii_page(self):
+        patterns = {
+            "premium": {"regex": r"(Total\s*Premium)\s*[:]\s*(?:Rs\.|₹)?\s*([\d,]+)", "keywords": ["total premium"]},
+        }
+        extractor = FieldExtractor(patterns)
+        self.assertEqual(extractor.extract("Total Premium: ₹ 25,000")["premium"]["value"], "25,000")
+        self.assertEqual(extractor.extract("Total Premium: Rs. 25,000")["premium"]["value"], "25,000")
+
+
+class TestAsciiRegexes(unittest.TestCase):
+    @unittest.skipIf(extractor.re2 is None, "google-re2 not installed")
+    def test_plain_pattern_compiles_with_re2(self):
+        fe = FieldExtractor({"premium": {"regex": r"(Total\s*Premium)\s*:\s*(\d+)", "keywords": ["total premium"]}})
+        self.assertIsInstance(fe._ascii_regexes["premium"], type(extractor.re2.compile("a")))
+
+    def test_patterns_re2_cannot_run_fall_back_to_re(self):
+        patterns = {
+            "lookbehind": {"regex": r"(?<=Premium:)\s*(\d+)", "keywords": ["premium"]},
+            "bounded": {"regex": r"(Premium):\s{,3}(\d+)", "keywords": ["premium"]},
+        }
+        fe = FieldExtractor(patterns)
+        for name in patterns:
+            self.assertIsInstance(fe._ascii_regexes[name], re.Pattern)
+
+        ascii_results = fe.extract("Premium:  750")
+        unicode_results = fe.extract("Premium:  750 é")
+        for name in patterns:
+            self.assertEqual(ascii_results[name]["value"], "750")
+            self.assertEqual(ascii_results[name], unicode_results[name])
+
+    def test_pages_with_ascii_unsafe_whitespace_use_unicode_regexes(self):
+        fe = FieldExtractor({"premium": {"regex": r"(Total\s*Premium)\s*:\s*(\d+)", "keywords": ["total premium"]}})
+        # Any use of the ASCII variants would raise KeyError
+        fe._ascii_regexes = {}
+        for text in ("Total Premium:\v500", "Total Premium:\x1c500"):
+            results = fe.extract(text)
+            self.assertEqual(results["premium"]["value"], "500")
+            self.assertEqual(results["premium"]["method"], "regex")
+
+    def test_re2_module_without_options_is_ignored(self):
+        self.addCleanup(importlib.reload, extractor)
+        with mock.patch.dict(sys.modules, {"re2": types.ModuleType("re2")}):
+            importlib.reload(extractor)
+            self.assertIsNone(extractor.re2)
+            fe = extractor.FieldExtractor({"premium": {"regex": r"(Total\s*Premium)\s*:\s*(\d+)", "keywords": ["total premium"]}})
+            self.assertIsInstance(fe._ascii_regexes["premium"], re.Pattern)
+            self.assertEqual(fe.extract("Total Premium: 500")["premium"]["value"], "500")
+
+
+class TestExtractPages(unittest.TestCase):
+    patterns = {
+        "premium": {"regex": r"(Total\s*Premium)\s*:\s*([\d,]*)", "keywords": ["total premium"]},
+        "policy_number": {"regex": r"(Policy\s*Number)\s*:\s*(\d+)", "keywords": ["policy number"]},
+    }
+
+    def test_stops_reading_pages_once_every_field_has_a_regex_match(self):
+        pages = ["Cover page", "Total Premium: 500", "Policy Number: 42", "Total Premium: 900"]
+        consumed = []
+
+        def page_iter():
+            for page in pages:
+                consumed.append(page)
+                yield page
+
+        results = FieldExtractor(self.patterns).extract_pages(page_iter())
+        self.assertEqual(consumed, pages[:3])
+        self.assertEqual(results["premium"]["value"], "500")
+        self.assertEqual(results["policy_number"]["value"], "42")
+
+    def test_first_regex_match_in_page_order_wins(self):
+        pages = ["Total Premium: 100", "Total Premium: 200\nPolicy Number: 1"]
+        results = FieldExtractor(self.patterns).extract_pages(pages)
+        self.assertEqual(results["premium"]["value"], "100")
+        self.assertEqual(results["premium"]["method"], "regex")
+
+    def test_later_page_with_better_fuzzy_hit_wins(self):
+        pages = ["Totl Premum - 100", "Total Premium = 200"]
+        results = FieldExtractor(self.patterns).extract_pages(pages)
+        self.assertEqual(results["premium"]["value"], "200")
+        self.assertEqual(results["premium"]["method"], "fuzzy (score: 100.0)")
+
+    def test_equal_fuzzy_hit_on_later_page_does_not_replace_earlier(self):
+        pages = ["Total Premium = 100", "Total Premium = 200"]
+        results = FieldExtractor(self.patterns).extract_pages(pages)
+        self.assertEqual(results["premium"]["value"], "100")
+
+    def test_empty_regex_value_only_used_as_last_resort(self):
+        extractor = FieldExtractor(self.patterns)
+
+        results = extractor.extract_pages(["Total Premium:", "nothing here"])
+        self.assertEqual(results["premium"], {"value": "", "confidence": 0.95, "method": "regex"})
+
+        results = extractor.extract_pages(["Total Premium:", "Total Premum = 300"])
+        self.assertEqual(results["premium"]["value"], "300")
+        self.assertTrue(results["premium"]["method"].startswith("fuzzy"))
+
+        results = extractor.extract_pages(["Total Premium:", "Total Premium: 400"])
+        self.assertEqual(results["premium"]["value"], "400")
+        self.assertEqual(results["premium"]["method"], "regex")
+
+    def test_no_match_anywhere(self):
+        results = FieldExtractor(self.patterns).extract_pages(iter(["Cover page", "Page 2"]))
+        self.assertEqual(results["policy_number"], {"value": None, "confidence": 0.0, "method": "none"})
+
+
+class TestLeadLiteral(unittest.TestCase):
+    def test_alternation_has_no_common_literal(self):
+        self.assertIsNone(_lead_literal(r"(Policy|Plan)\s*No\s*:\s*(\w+)"))
+
+    def test_alternation_common_prefix(self):
+        self.assertEqual(_lead_literal(r"(Policy\s*Number|Policy\s*No)\s*:\s*(\d+)"), ("policy", 0))
+
+    def test_optional_group_is_skipped(self):
+        self.assertEqual(_lead_literal(r"(?:Net\s*)?Premium\s*:\s*(\d+)"), ("premium", None))
+
+    def test_bounded_prefix(self):
+        self.assertEqual(_lead_literal(r"^.{0,5}Sum Assured:(\d+)"), ("sum assured:", 5))
+        self.assertEqual(_lead_literal(r"(Total\s*Premium)\s*[:]\s*([\d,]+)"), ("total", 0))
+
+    def test_unbounded_prefix(self):
+        self.assertEqual(_lead_literal(r".*Amount (\d+)"), ("amount ", None))
+
+    def test_no_usable_literal(self):
+        self.assertIsNone(_lead_literal(r"\w+\s*:\s*(\d+)"))
+        self.assertIsNone(_lead_literal(r"(ID)\s*:\s*(\d+)"))
+        self.assertIsNone(_lead_literal(r"(unbalanced"))
+
+    def test_parser_failure_degrades_to_none(self):
+        with mock.patch.object(extractor, "_sre_parse", object()):
+            self.assertIsNone(_lead_literal(r"(Total\s*Premium)\s*:\s*(\d+)"))
+            results = FieldExtractor({
+                "premium": {"regex": r"(Total\s*Premium)\s*:\s*(\d+)", "keywords": ["total premium"]},
+            }).extract("Total Premium: 500")
+        self.assertEqual(results["premium"]["value"], "500")
+
+    def test_bounded_prefix_still_matches_later_on_page(self):
+        patterns = {"sum_assured": {"regex": r"^.{0,5}Sum Assured:(\d+)", "keywords": ["sum assured"]}}
+        text = "Header\nSum Assured: none\nNo. 1 Sum Assured:900"
+        results = FieldExtractor(patterns).extract(text)
+        self.assertEqual(results["sum_assured"]["value"], "900")
+
+
+class TestFuzzyFallback(unittest.TestCase):
+    patterns = {
+        "premium": {"regex": r"(Total\s*Premium)\s*:\s*([\d,]+)", "keywords": ["total premium"]},
+        "sum_assured": {"regex": r"(Sum\s*Assured)\s*:\s*([\d,]+)", "keywords": ["sum assured"]},
+        "policy_number": {"regex": r"(Policy\s*Number)\s*:\s*(\d+)", "keywords": ["policy number"]},
+    }
+
+    def test_ocr_damaged_labels_match_fuzzily(self):
+        text = "Total Premum - 1,200\nSum Asured = 5,00,000\nPolicy Numbr # 99812"
+        results = FieldExtractor(self.patterns).extract(text)
+        self.assertEqual(results["premium"]["value"], "1,200")
+        self.assertEqual(results["sum_assured"]["value"], "5,00,000")
+        self.assertEqual(results["policy_number"]["value"], "99812")
+        for result in results.values():
+            self.assertTrue(result["method"].startswith("fuzzy"))
+
+    def test_label_line_without_number_is_skipped(self):
+        text = "Total Premum is shown below\nAmount due 3,400"
+        results = FieldExtractor(self.patterns).extract(text)
+        self.assertIsNone(results["premium"]["value"])
+
+    def test_unrelated_lines_do_not_match(self):
+        results = FieldExtractor(self.patterns).extract("Invoice 12\nPage 1 of 3")
+        for result in results.values():
+            self.assertIsNone(result["value"])
+
+
+class TestFuzzyPool(unittest.TestCase):
+    def test_concurrent_first_use_creates_one_pool(self):
+        created = []
+
+        class SlowPool(extractor.ThreadPoolExecutor):
+            def __init__(self, *args, **kwargs):
+                # Widen the window between the None check and the assignment
+                time.sleep(0.01)
+                super().__init__(*args, **kwargs)
+                created.append(self)
+
+        pools = []
+        barrier = threading.Barrier(8)
+
+        def get_pool():
+            barrier.wait()
+            pools.append(extractor._fuzzy_pool())
+
+        with mock.patch.object(extractor, "_FUZZY_POOL", None), \
+                mock.patch.object(extractor, "ThreadPoolExecutor", SlowPool):
+            threads = [threading.Thread(target=get_pool) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        for pool in created:
+            pool.shutdown()
+
+        self.assertEqual(len(created), 1)
+        self.assertEqual(len(pools), 8)
+        self.assertTrue(all(pool is created[0] for pool in pools))
+
+
+if __name__ == "__main__":
+    unittest.main()
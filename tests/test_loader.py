@@ -0,0 +1,200 @@
+import os
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from types import SimpleNamespace
+from unittest import mock
+
+import loader
+from loader import DocumentLoader
+
+
+class _FakePage:
+    def __init__(self, images):
+        self.images = images
+
+
+def _write_pdf(path, page_texts):
+    """
+    Writes a minimal text-only PDF (Helvetica, one line per text line).
+    """
+    count = len(page_texts)
+    font_num = 3 + 2 * count
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [%s] /Count %d >>" % (" ".join(f"{3 + 2 * i} 0 R" for i in range(count)), count),
+    ]
+    for i, text in enumerate(page_texts):
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {4 + 2 * i} 0 R "
+            f"/Resources << /Font << /F1 {font_num} 0 R >> >> >>"
+        )
+        stream = "BT /F1 12 Tf 72 720 Td " + " ".join(f"({line}) Tj 0 -14 Td" for line in text.split("\n") if line) + " ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = "%PDF-1.4\n"
+    offsets = []
+    for i, obj in enumerate(objects):
+        offsets.append(len(out))
+        out += f"{i + 1} 0 obj\n{obj}\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    with open(path, "w", encoding="latin-1") as f:
+        f.write(out)
+
+
+class TestNeedsOcr(unittest.TestCase):
+    def test_blank_page_without_images_is_not_ocrd(self):
+        self.assertFalse(DocumentLoader._needs_ocr(_FakePage([]), ""))
+
+    def test_digit_only_page_without_images_is_not_ocrd(self):
+        self.assertFalse(DocumentLoader._needs_ocr(_FakePage([]), "12,345.00 67,890"))
+
+    def test_image_page_with_little_text_is_ocrd(self):
+        self.assertTrue(DocumentLoader._needs_ocr(_FakePage(["scan"]), ""))
+        self.assertTrue(DocumentLoader._needs_ocr(_FakePage(["scan"]), "Page 1"))
+
+    def test_text_heavy_page_is_not_ocrd(self):
+        self.assertFalse(DocumentLoader._needs_ocr(_FakePage(["logo"]), "a" * loader.MIN_ALPHA_CHARS_PER_PAGE))
+
+
+class TestLoadTxt(unittest.TestCase):
+    def _load(self, data):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "policy.txt")
+            with open(path, "wb") as f:
+                f.write(data)
+            text = DocumentLoader().load(path)
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(text, f.read())
+        return text
+
+    def test_empty_file(self):
+        self.assertEqual(self._load(b""), "")
+
+    def test_crlf_newlines(self):
+        self.assertEqual(self._load(b"Policy No: P1\r\nPremium: 500\r\n"), "Policy No: P1\nPremium: 500\n")
+
+    def test_cr_only_newlines(self):
+        self.assertEqual(self._load(b"Policy No: P1\rPremium: 500\r"), "Policy No: P1\nPremium: 500\n")
+
+    def test_utf8_text(self):
+        self.assertEqual(self._load("Premium: ₹ 500".encode("utf-8")), "Premium: ₹ 500")
+
+    def test_invalid_utf8_raises(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "policy.txt")
+            with open(path, "wb") as f:
+                f.write("Premium: 500 £".encode("latin-1"))
+            with self.assertRaises(UnicodeDecodeError):
+                DocumentLoader().load(path)
+
+
+class TestOcrWorkers(unittest.TestCase):
+    def test_defaults_to_cpu_count(self):
+        self.assertEqual(DocumentLoader().ocr_workers, os.cpu_count() or 1)
+
+    def test_explicit_limit(self):
+        self.assertEqual(DocumentLoader(ocr_workers=1).ocr_workers, 1)
+
+
+@unittest.skipIf(loader.PdfReader is None, "pypdf not installed")
+class TestLoadPdf(unittest.TestCase):
+    def test_digit_only_page_keeps_its_digital_text(self):
+        body = "This policy schedule describes the coverage benefits terms and conditions applicable to the insured"
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "schedule.pdf")
+            _write_pdf(path, [body, "", "12,345.00 67,890"])
+            out = StringIO()
+            with redirect_stdout(out):
+                text = DocumentLoader().load(path)
+        self.assertNotIn("Detected scanned", out.getvalue())
+        self.assertIn("12,345.00 67,890", text)
+
+    def _stub_ocr(self):
+        """
+        Treats pages whose text contains SCAN as scanned and replaces
+        Poppler/Tesseract with stubs; page 1's OCR finishes last.
+        """
+        def convert_from_path(file_path, dpi, first_page, last_page):
+            if first_page == 1:
+                time.sleep(0.05)
+            return [f"image {first_page}"]
+
+        tesseract = SimpleNamespace(image_to_string=lambda image, config: f"OCR {image}")
+        return [
+            mock.patch.object(loader, "OCR_AVAILABLE", True),
+            mock.patch.object(loader, "convert_from_path", convert_from_path, create=True),
+            mock.patch.object(loader, "pytesseract", tesseract, create=True),
+            mock.patch.object(DocumentLoader, "_needs_ocr", staticmethod(lambda page, content: "SCAN" in content)),
+        ]
+
+    def test_mixed_ocr_and_digital_pages_come_out_in_order(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "mixed.pdf")
+            _write_pdf(path, ["SCAN", "Digital two", "SCAN", "Digital four"])
+            patches = self._stub_ocr()
+            for patch in patches:
+                patch.start()
+                self.addCleanup(patch.stop)
+            with redirect_stdout(StringIO()):
+                pages = list(DocumentLoader().iter_pages(path))
+        self.assertEqual([index for index, _ in pages], [0, 1, 2, 3])
+        self.assertEqual([text.strip() for _, text in pages], ["OCR image 1", "Digital two", "OCR image 3", "Digital four"])
+
+    def test_closing_early_releases_the_file_and_the_pool(self):
+        opened = []
+        pools = []
+        open_pdf = DocumentLoader._open_pdf
+
+        def recording_open_pdf(file_path):
+            mm, reader = open_pdf(file_path)
+            opened.append(mm)
+            return mm, reader
+
+        class RecordingPool(loader.ThreadPoolExecutor):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                pools.append(self)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "mixed.pdf")
+            _write_pdf(path, ["SCAN", "Digital two", "SCAN"])
+            patches = self._stub_ocr() + [
+                mock.patch.object(DocumentLoader, "_open_pdf", staticmethod(recording_open_pdf)),
+                mock.patch.object(loader, "ThreadPoolExecutor", RecordingPool),
+            ]
+            for patch in patches:
+                patch.start()
+                self.addCleanup(patch.stop)
+
+            with redirect_stdout(StringIO()):
+                pages = DocumentLoader().iter_pages(path)
+                self.assertEqual(next(pages)[0], 0)
+                pages.close()
+            self.assertTrue(opened[0].closed)
+            self.assertTrue(pools[0]._shutdown)
+
+            # A generator that is never iterated still releases the file when closed
+            pages = DocumentLoader().iter_pages(path)
+            self.assertFalse(opened[1].closed)
+            pages.close()
+            self.assertTrue(opened[1].closed)
+            self.assertTrue(pools[1]._shutdown)
+
+    def test_invalid_pdf_raises_from_iter_pages(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "broken.pdf")
+            with open(path, "wb") as f:
+                f.write(b"not a pdf")
+            with self.assertRaises(Exception):
+                DocumentLoader().iter_pages(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from io import StringIO
+from unittest import mock
+
+try:
+    import main
+except ImportError:  # the patterns package is not available
+    main = None
+
+PATTERNS = {
+    "premium": {"regex": r"(Total\s*Premium)\s*:\s*([\d,]+)", "keywords": ["total premium"]},
+}
+
+
+@unittest.skipIf(main is None, "patterns package not available")
+class TestRunBatch(unittest.TestCase):
+    def test_one_record_per_file_in_sorted_order(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "b_good.txt"), "w", encoding="utf-8") as f:
+                f.write("Total Premium: 25,000\n")
+            with open(os.path.join(tmp, "a_latin1.txt"), "wb") as f:
+                f.write("Total Premium: 500 £\n".encode("latin-1"))
+            open(os.path.join(tmp, "c_empty.txt"), "w").close()
+            open(os.path.join(tmp, "notes.md"), "w").close()
+            output_path = os.path.join(tmp, "results.jsonl")
+
+            with redirect_stdout(StringIO()):
+                main.run_batch(tmp, PATTERNS, output_path)
+            with open(output_path, encoding="utf-8") as f:
+                records = [json.loads(line) for line in f]
+
+        self.assertEqual(
+            [os.path.basename(record["file"]) for record in records],
+            ["a_latin1.txt", "b_good.txt", "c_empty.txt"],
+        )
+        self.assertIn("error", records[0])
+        self.assertEqual(records[1]["results"]["premium"]["value"], "25,000")
+        self.assertNotIn("error", records[2])
+        self.assertIsNone(records[2]["results"]["premium"]["value"])
+
+
+@unittest.skipIf(main is None, "patterns package not available")
+class TestArguments(unittest.TestCase):
+    def _run(self, *argv):
+        stderr = StringIO()
+        with mock.patch.object(sys, "argv", ["main.py", *argv]), redirect_stderr(stderr):
+            with self.assertRaises(SystemExit) as ctx:
+                main.main()
+        return ctx.exception.code, stderr.getvalue()
+
+    def test_requires_file_or_batch(self):
+        code, err = self._run()
+        self.assertEqual(code, 2)
+        self.assertIn("either file_path or --batch DIR is required", err)
+
+    def test_rejects_file_with_batch(self):
+        code, err = self._run("policy.pdf", "--batch", "docs")
+        self.assertEqual(code, 2)
+        self.assertIn("cannot be used together", err)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+from preprocessor import clean_text, normalize_amount
+
+
+class TestCleanText(unittest.TestCase):
+    def test_collapses_spaces_and_trims_lines(self):
+        self.assertEqual(clean_text("  Policy \t No:\xa0 P1  \n\n  Premium:  500 "), "Policy No: P1\n\nPremium: 500")
+
+    def test_removes_non_printable_characters(self):
+        # Controls, format (soft hyphen, bidi marks, BOM), private-use,
+        # unassigned and non-space separators are deleted, not turned into spaces
+        text = "Sum\x00\x85 As\xadsu\u200ered\ufeff:\ue000 1\u3000\u2003000\u0378\u2028"
+        self.assertEqual(clean_text(text), "Sum Assured: 1000")
+
+    def test_keeps_unicode_text(self):
+        self.assertEqual(clean_text("Premium: ₹ 25,000 — नमस्ते"), "Premium: ₹ 25,000 — नमस्ते")
+
+    def test_empty(self):
+        self.assertEqual(clean_text(""), "")
+
+
+class TestNormalizeAmount(unittest.TestCase):
+    def test_rupee_prefix(self):
+        self.assertEqual(normalize_amount("Rs. 25,000.00"), 25000.0)
+        self.assertEqual(normalize_amount("₹ 25,000.00"), 25000.0)
+        self.assertEqual(normalize_amount("Rs.25,000"), 25000.0)
+        self.assertEqual(normalize_amount("Rs.1,500"), 1500.0)
+        self.assertEqual(normalize_amount("RS. 1,500.75"), 1500.75)
+
+    def test_trailing_period_is_not_the_decimal_point(self):
+        self.assertEqual(normalize_amount("Rs. 1,234.50."), 1234.5)
+        self.assertEqual(normalize_amount("1,234.50."), 1234.5)
+        self.assertEqual(normalize_amount("0.5."), 0.5)
+        self.assertEqual(normalize_amount("Rs. 25."), 25.0)
+
+    def test_leading_decimal_point(self):
+        self.assertEqual(normalize_amount(".5"), 0.5)
+
+    def test_dotted_grouping(self):
+        self.assertEqual(normalize_amount("1.234.567.89"), 1234567.89)
+
+    def test_unparseable(self):
+        self.assertEqual(normalize_amount(""), 0.0)
+        self.assertEqual(normalize_amount("Rs."), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()